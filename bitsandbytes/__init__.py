@@ -3,6 +3,18 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import os
+
+from .cuda_setup.main import CUDASetup
+
+if os.environ.get("BNB_ASYNC_INIT", "0") == "1":
+    # Start probing for the CUDA runtime and loading the compiled library in
+    # the background so it overlaps with the remaining (slow) imports below.
+    # This must happen before anything pulls in cextension (research imports
+    # it transitively), which would otherwise run the setup synchronously
+    # first; cextension joins the thread before the library handle is used.
+    CUDASetup.get_instance().run_cuda_setup_async()
+
 from . import cuda_setup, research, utils
 from .autograd._functions import (
     MatmulLtState,
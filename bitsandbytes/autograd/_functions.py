@@ -1,6 +1,5 @@
-from dataclasses import dataclass
-from functools import reduce  # Required in Python 3
-import operator
+from collections import OrderedDict
+import threading
 from typing import Callable, Optional, Tuple
 import warnings
 from warnings import warn
@@ -9,11 +8,6 @@ import torch
 
 import bitsandbytes.functional as F
 
-
-# math.prod not compatible with python < 3.8
-def prod(iterable):
-    return reduce(operator.mul, iterable, 1)
-
 # The inverse transformation for the colTuring and colAmpere format were contributed by Alex Borzunov:
 # https://github.com/bigscience-workshop/petals/blob/main/src/petals/utils/linear8bitlt_patch.py
 
@@ -31,7 +25,9 @@ class GlobalOutlierPooler:
         raise RuntimeError("Call get_instance() instead")
 
     def initialize(self):
-        self.outliers = set()
+        # lazily allocated on the first update so the pool lives on the same
+        # device as the incoming indices (no host sync per layer)
+        self.outliers = None
         self.model_dim = None
 
     @classmethod
@@ -47,10 +43,16 @@ class GlobalOutlierPooler:
         if feature_dim != self.model_dim:
             return  # we do not encode outliers for the 2nd FFN layer
 
-        self.outliers.update(outlier_idx.tolist())
+        outlier_idx = outlier_idx.to(torch.int64)
+        if self.outliers is None:
+            self.outliers = torch.unique(outlier_idx)
+        else:
+            self.outliers = torch.unique(torch.cat((self.outliers, outlier_idx.to(self.outliers.device))))
 
     def get_current_outlier_idx(self):
-        return torch.Tensor(list(self.outliers)).to(torch.int64)
+        if self.outliers is None:
+            return torch.empty((0,), dtype=torch.int64)
+        return self.outliers
 
 
 def get_inverse_transform_indices(
@@ -101,6 +103,154 @@ def undo_layout(permuted_tensor: torch.Tensor, tile_indices: torch.LongTensor) -
     return outputs.reshape(rows, cols).contiguous()
 
 
+# pool of transient int8 activation buffers reused across layers: decode loops
+# fire hundreds of identically-shaped forwards back-to-back and the repeated
+# allocator round-trips for CA/C32A are measurable. The pool is thread-local
+# and keyed on (rows, cols, device); it is only consulted when no gradients
+# are required, so a pooled buffer is never captured by autograd. Kernels on
+# the same stream are ordered, so reuse cannot race with the previous layer.
+_int8_buffer_pool = threading.local()
+
+# retain at most this many distinct shapes per thread. Decoding hits a single
+# steady-state shape; variable-length prefill would otherwise pin a buffer
+# pair per sequence length forever, growing without bound
+_INT8_BUFFER_POOL_MAX_SHAPES = 4
+
+
+def _get_int8_forward_buffers(rows, cols, device):
+    pool = getattr(_int8_buffer_pool, 'buffers', None)
+    if pool is None:
+        pool = _int8_buffer_pool.buffers = OrderedDict()
+    key = (rows, cols, device)
+    bufs = pool.get(key)
+    if bufs is None:
+        # zeros, not empty: the col32 transform does not touch the padding
+        # columns and igemmlt expects them to stay zero
+        out_row = torch.zeros((rows, cols), dtype=torch.int8, device=device)
+        out_col32 = torch.zeros((rows, 32 * ((cols + 31) // 32)), dtype=torch.int8, device=device)
+        bufs = pool[key] = (out_row, out_col32)
+        if len(pool) > _INT8_BUFFER_POOL_MAX_SHAPES:
+            # evict the least recently used shape back to the allocator
+            pool.popitem(last=False)
+    else:
+        pool.move_to_end(key)
+    return bufs
+
+
+def _mm8bit_backward_3d(A, B, grad_output, req_gradA, req_gradB, quant_type, precision):
+    # specialization of MatMul8bit.backward for 3D inputs: the quantization
+    # dims ([0, 1] / [2]) and the bsi -> ibs permutation [0, 2, 1] are folded
+    # in as constants so the hot path carries no shape branches
+    grad_A = grad_B = None
+
+    if req_gradB:
+        if precision[1] != 8:
+            with torch.no_grad():
+                grad_B = torch.matmul(A.permute([0, 2, 1]), grad_output)
+        elif len(B.shape) == 2:
+            grad_output = grad_output.contiguous()
+            qgrad_output, S1 = F.vectorwise_quant(
+                grad_output.view(-1, grad_output.shape[2]),
+                dim=0,
+                quant_type=quant_type,
+            )
+            if not A.is_contiguous():
+                A = A.contiguous()
+            qA, S2 = F.vectorwise_quant(
+                A.view(-1, A.shape[2]), dim=0, quant_type=quant_type
+            )
+            igrad_B = F.igemm(qA.t(), qgrad_output)
+            grad_B = F.vectorwise_mm_dequant(
+                igrad_B, S2.t(), S1, grad_output.dtype, quant_type
+            )
+        else:
+            qgrad_output, S1 = F.vectorwise_quant(
+                grad_output, dim=[0, 1], quant_type=quant_type
+            )
+            qA, S2 = F.vectorwise_quant(A, dim=[0, 1], quant_type=quant_type)
+            igrad_B = F.igemm(qA.permute([0, 2, 1]), qgrad_output)
+            grad_B = F.vectorwise_mm_dequant(
+                igrad_B,
+                S2.permute([0, 2, 1]),
+                S1,
+                grad_output.dtype,
+                quant_type,
+            )
+
+    if req_gradA:
+        if len(B.shape) == 3:
+            # bio -> boi
+            permute_dim = [0, 2, 1]
+            dim_B = [2]
+        else:
+            # io -> oi
+            permute_dim = [1, 0]
+            dim_B = [1]
+
+        if precision[2] != 8:
+            with torch.no_grad():
+                grad_A = torch.matmul(grad_output, B.permute(permute_dim))
+        else:
+            qgrad_output, S1 = F.vectorwise_quant(
+                grad_output, dim=[2], quant_type=quant_type
+            )
+            qB, S3 = F.vectorwise_quant(B, dim=dim_B, quant_type=quant_type)
+            igrad_A = F.igemm(qgrad_output, qB.permute(permute_dim))
+            grad_A = F.vectorwise_mm_dequant(
+                igrad_A,
+                S1,
+                S3.permute(permute_dim),
+                grad_output.dtype,
+                quant_type,
+            )
+
+    return grad_A, grad_B
+
+
+def _mm8bit_backward_2d(A, B, grad_output, req_gradA, req_gradB, quant_type, precision):
+    # specialization of MatMul8bit.backward for 2D inputs: quantization dims
+    # ([0] / [1]) and the bs -> sb permutation [1, 0] are constants here
+    grad_A = grad_B = None
+
+    if req_gradB:
+        if precision[1] != 8:
+            with torch.no_grad():
+                grad_B = torch.matmul(A.permute([1, 0]), grad_output)
+        else:
+            qgrad_output, S1 = F.vectorwise_quant(
+                grad_output, dim=[0], quant_type=quant_type
+            )
+            qA, S2 = F.vectorwise_quant(A, dim=[0], quant_type=quant_type)
+            igrad_B = F.igemm(qA.permute([1, 0]), qgrad_output)
+            grad_B = F.vectorwise_mm_dequant(
+                igrad_B,
+                S2.permute([1, 0]),
+                S1,
+                grad_output.dtype,
+                quant_type,
+            )
+
+    if req_gradA:
+        if precision[2] != 8:
+            with torch.no_grad():
+                grad_A = torch.matmul(grad_output, B.permute([1, 0]))
+        else:
+            qgrad_output, S1 = F.vectorwise_quant(
+                grad_output, dim=[1], quant_type=quant_type
+            )
+            qB, S3 = F.vectorwise_quant(B, dim=[1], quant_type=quant_type)
+            igrad_A = F.igemm(qgrad_output, qB.permute([1, 0]))
+            grad_A = F.vectorwise_mm_dequant(
+                igrad_A,
+                S1,
+                S3.permute([1, 0]),
+                grad_output.dtype,
+                quant_type,
+            )
+
+    return grad_A, grad_B
+
+
 class MatMul8bit(torch.autograd.Function):
     @staticmethod
     def forward(ctx, A, B, out=None, quant_type="vector", precision=None):
@@ -130,89 +280,19 @@ class MatMul8bit(torch.autograd.Function):
     @staticmethod
     def backward(ctx, grad_output):
         A, B = ctx.saved_tensors
-        quant_type = ctx.quant_type
-        precision = ctx.precision
-        grad_A = grad_B = None
-
-        if B.requires_grad:
-            if len(A.shape) == 3:
-                dims = [0, 1]
-                # bsi -> ibs
-                permute_dim = [0, 2, 1]
-            else:
-                dims = [0]
-                # bs -> sb
-                permute_dim = [1, 0]
-
-            if precision[1] != 8:
-                with torch.no_grad():
-                    grad_B = torch.matmul(A.permute(permute_dim), grad_output)
-            else:
-                if len(B.shape) == 2 and len(A.shape) == 3:
-                    grad_output = grad_output.contiguous()
-                    if not grad_output.is_contiguous():
-                        grad_output.contiguous()
-                    qgrad_output, S1 = F.vectorwise_quant(
-                        grad_output.view(-1, grad_output.shape[2]),
-                        dim=0,
-                        quant_type=quant_type,
-                    )
-                    if not A.is_contiguous():
-                        A = A.contiguous()
-                    qA, S2 = F.vectorwise_quant(
-                        A.view(-1, A.shape[2]), dim=0, quant_type=quant_type
-                    )
-                    igrad_B = F.igemm(qA.t(), qgrad_output)
-                    grad_B = F.vectorwise_mm_dequant(
-                        igrad_B, S2.t(), S1, grad_output.dtype, quant_type
-                    )
-                else:
-                    qgrad_output, S1 = F.vectorwise_quant(
-                        grad_output, dim=dims, quant_type=quant_type
-                    )
-                    qA, S2 = F.vectorwise_quant(
-                        A, dim=dims, quant_type=quant_type
-                    )
-                    igrad_B = F.igemm(qA.permute(permute_dim), qgrad_output)
-                    grad_B = F.vectorwise_mm_dequant(
-                        igrad_B,
-                        S2.permute(permute_dim),
-                        S1,
-                        grad_output.dtype,
-                        quant_type,
-                    )
-
-        if A.requires_grad:
-            if len(grad_output.shape) == 3:
-                dims = [2]
-            else:
-                dims = [1]
 
-            if len(B.shape) == 3:
-                # bio -> boi
-                permute_dim = [0, 2, 1]
-                dim_B = dims
-            else:
-                # io -> oi
-                permute_dim = [1, 0]
-                dim_B = [1]
-
-            if precision[2] != 8:
-                with torch.no_grad():
-                    grad_A = torch.matmul(grad_output, B.permute(permute_dim))
-            else:
-                qgrad_output, S1 = F.vectorwise_quant(
-                    grad_output, dim=dims, quant_type=quant_type
-                )
-                qB, S3 = F.vectorwise_quant(B, dim=dim_B, quant_type=quant_type)
-                igrad_A = F.igemm(qgrad_output, qB.permute(permute_dim))
-                grad_A = F.vectorwise_mm_dequant(
-                    igrad_A,
-                    S1,
-                    S3.permute(permute_dim),
-                    grad_output.dtype,
-                    quant_type,
-                )
+        # dispatch once on the input rank to a body with the quantization dims
+        # and permutations folded in as constants
+        backward_fn = _mm8bit_backward_3d if len(A.shape) == 3 else _mm8bit_backward_2d
+        grad_A, grad_B = backward_fn(
+            A,
+            B,
+            grad_output,
+            A.requires_grad,
+            B.requires_grad,
+            ctx.quant_type,
+            ctx.precision,
+        )
 
         return grad_A, grad_B, None, None, None
 
@@ -246,30 +326,61 @@ def get_tile_inds(format, device):
     with torch.no_grad():
         return get_inverse_transform_indices(transform, _get_tile_size(format)).to(device)
 
-@dataclass
 class MatmulLtState:
-    _tile_indices: Optional[torch.Tensor] = None
-    force_no_igemmlt: bool = False
-    CB = None
-    CxB = None
-    SB = None
-    SCB = None
-
-    CxBt = None
-    SBt = None
-    CBt = None
-
-    subB = None
-
-    outlier_pool = None
-    has_accumulated_gradients = False
-    threshold = 0.0
-    idx = None
-    is_training = True
-    has_fp16_weights = True
-    memory_efficient_backward = False
-    use_pool = False
-    formatB = F.get_special_format_str()
+    # a plain __slots__ class instead of a dataclass: the state attributes are
+    # read many times per forward/backward and slot access skips the __dict__
+    # lookup while also shrinking the per-layer footprint
+    __slots__ = (
+        "_tile_indices",
+        "force_no_igemmlt",
+        "CB",
+        "CxB",
+        "SB",
+        "SCB",
+        "CxBt",
+        "SBt",
+        "CBt",
+        "SCBt",
+        "subB",
+        "scales",
+        "_dequant_CB",
+        "outlier_pool",
+        "has_accumulated_gradients",
+        "threshold",
+        "idx",
+        "is_training",
+        "has_fp16_weights",
+        "memory_efficient_backward",
+        "use_pool",
+        "formatB",
+    )
+
+    def __init__(self):
+        self._tile_indices: Optional[torch.Tensor] = None
+        self.force_no_igemmlt = False
+        self.CB = None
+        self.CxB = None
+        self.SB = None
+        self.SCB = None
+
+        self.CxBt = None
+        self.SBt = None
+        self.CBt = None
+        self.SCBt = None
+
+        self.subB = None
+        self.scales = None
+        self._dequant_CB = None
+
+        self.outlier_pool = None
+        self.has_accumulated_gradients = False
+        self.threshold = 0.0
+        self.idx = None
+        self.is_training = True
+        self.has_fp16_weights = True
+        self.memory_efficient_backward = False
+        self.use_pool = False
+        self.formatB = F.get_special_format_str()
 
     def reset_grads(self):
         self.CB = None
@@ -280,6 +391,11 @@ class MatmulLtState:
         self.CxBt = None
         self.SBt = None
         self.CBt = None
+        self.scales = None
+        self._dequant_CB = None
+        # cached outlier columns of B are derived from CB/SCB, so they go stale
+        # together with them
+        self.subB = None
 
     @property
     def tile_indices(self):
@@ -297,7 +413,7 @@ class MatMul8bitLt(torch.autograd.Function):
         using_igemmlt = supports_igemmlt(A.device) and not state.force_no_igemmlt
         # default of pytorch behavior if inputs are empty
         ctx.is_empty = False
-        if prod(A.shape) == 0:
+        if A.numel() == 0:
             ctx.is_empty = True
             ctx.A = A
             ctx.B = B
@@ -322,26 +438,38 @@ class MatMul8bitLt(torch.autograd.Function):
             warnings.warn(f"MatMul8bitLt: inputs will be cast from {A.dtype} to float16 during quantization")
 
         # 1. Quantize A
+        # reshape gives a view for contiguous inputs and the cast is skipped when A
+        # is already fp16, so the common case adds no extra pass over A
         if len(A.shape) == 3:
             A = A.reshape(-1, A.shape[-1])
-        CA, CAt, SCA, SCAt, coo_tensorA = F.double_quant(A.to(torch.float16), threshold=state.threshold)
-
-        if state.threshold > 0.0 and coo_tensorA is not None:
-            if state.has_fp16_weights:
-                idx = torch.unique(coo_tensorA.colidx).long()
-                CA[:, idx] = 0
-                CAt[:, idx] = 0
-                subA = A[:, idx]
-                state.subB = B[:, idx].t().contiguous()
-                state.idx = idx
-            else:
-                if state.CxB is None and using_igemmlt:
-                    # B in in 8-bit row-major, we can transform it back to 16-bit to extract outlier dimensions
-                    # we also need to convert it to the turing/ampere format
-                    state.CxB, state.SB = F.transform(state.CB, to_order=formatB)
+        A_fp16 = A if A.dtype == torch.float16 else A.to(torch.float16)
+        # CAt/SCAt are only consumed by backward; without gradients we skip the
+        # column-quantized output entirely (kernel writes half the bytes)
+        req_grads = any(ctx.needs_input_grad[:2])
+        if req_grads:
+            out_row = out_col32 = None
+        else:
+            out_row, out_col32 = _get_int8_forward_buffers(A_fp16.shape[0], A_fp16.shape[1], A_fp16.device)
+        CA, CAt, SCA, SCAt, coo_tensorA = F.double_quant(
+            A_fp16, out_row=out_row, threshold=state.threshold, compute_transpose=req_grads
+        )
+
+        # unique() is a GPU sort+scan, so resolve the outlier columns once and
+        # share the result between the fp16- and int8-weight branches below
+        outlier_cols = None if coo_tensorA is None else torch.unique(coo_tensorA.colidx).long()
+
+        # resolve the weight layout once instead of re-testing it per branch:
+        # B is in 8-bit row-major and both the outlier and non-outlier paths
+        # need it in the turing/ampere format when running through igemmlt
+        if not state.has_fp16_weights and using_igemmlt and state.CxB is None:
+            state.CxB, state.SB = F.transform(state.CB, to_order=formatB)
+
+        if state.threshold > 0.0 and coo_tensorA is not None and state.has_fp16_weights:
+            idx = outlier_cols
+            subA = F.gather_and_zero_outliers(A, CA, CAt, idx)
+            state.subB = B[:, idx].t().contiguous()
+            state.idx = idx
         else:
-            if not state.has_fp16_weights and state.CxB is None and using_igemmlt:
-                state.CxB, state.SB = F.transform(state.CB, to_order=formatB)
             subA = None
 
         # 2. Quantize B
@@ -360,6 +488,12 @@ class MatMul8bitLt(torch.autograd.Function):
                     state.SCBt,
                     coo_tensorB,
                 ) = F.double_quant(B.to(torch.float16))
+                # repack the row/column scales into one contiguous buffer so the
+                # dequant epilogues in forward and backward read adjacent memory;
+                # SCB/SCBt become views into it
+                state.scales = torch.cat((state.SCB, state.SCBt))
+                state.SCB = state.scales[: state.SCB.numel()]
+                state.SCBt = state.scales[state.SCB.numel():]
                 if using_igemmlt:
                     state.CxB, state.SB = F.transform(CB, to_order=formatB)
                 else:
@@ -370,23 +504,33 @@ class MatMul8bitLt(torch.autograd.Function):
         if coo_tensorA is not None and not state.has_fp16_weights:
             # extract outliers
 
-            outlier_idx = torch.unique(coo_tensorA.colidx)
-            state.idx = outlier_idx
+            prev_idx = state.idx
+            state.idx = outlier_cols
             # state.outlier_pool.add_outliers(outlier_idx, A.shape[-1])
             # if state.use_pool and state.outlier_pool.model_dim == A.shape[-1]:
             #    # do not use pool for 2nd FFN layer
             #    state.idx = state.outlier_pool.get_current_outlier_idx().to(A.device)
             # else:
             #    state.idx = outlier_idx
-            if state.CxB is not None:
-                outliers = F.extract_outliers(state.CxB, state.SB, state.idx.int())
-            else:
-                outliers = state.CB[:, state.idx.long()].clone()
 
-            state.subB = (outliers * state.SCB.view(-1, 1) / 127.0).t().contiguous().to(A.dtype)
-            CA[:, state.idx.long()] = 0
-            CAt[:, state.idx.long()] = 0
-            subA = A[:, state.idx.long()]
+            # outlier channels are systematic and mostly stable across batches,
+            # so only re-gather and rescale the dense weight columns when the
+            # set actually changed; the compact (idx, subB) pair on the state
+            # is the persistent representation
+            if (
+                state.subB is None
+                or state.subB.dtype != A.dtype
+                or prev_idx is None
+                or prev_idx.numel() != outlier_cols.numel()
+                or not torch.equal(prev_idx, outlier_cols)
+            ):
+                if state.CxB is not None:
+                    outliers = F.extract_outliers(state.CxB, state.SB, state.idx.int())
+                else:
+                    outliers = state.CB[:, state.idx.long()].clone()
+                state.subB = (outliers * state.SCB.view(-1, 1) / 127.0).t().contiguous().to(A.dtype)
+
+            subA = F.gather_and_zero_outliers(A, CA, CAt, state.idx.long())
 
         shapeB = state.SB[0] if state.SB else B.shape
 
@@ -397,20 +541,27 @@ class MatMul8bitLt(torch.autograd.Function):
 
         # 3. Matmul
         if using_igemmlt:
-            C32A, SA = F.transform(CA, "col32")
+            C32A, SA = F.transform(CA, "col32", out=out_col32)
             out32, Sout32 = F.igemmlt(C32A, state.CxB, SA, state.SB)
-            if bias is None or bias.dtype == torch.float16:
+            # dequantize straight into the input dtype where the kernel supports
+            # it; for bf16 activations this removes a full cast pass over the
+            # output and lets the bias fuse into the dequant as well
+            out_dtype = A.dtype if A.dtype == torch.bfloat16 else torch.float16
+            if bias is None or bias.dtype == out_dtype:
                 # we apply the fused bias here
-                output = F.mm_dequant(out32, Sout32, SCA, state.SCB, bias=bias)
+                output = F.mm_dequant(out32, Sout32, SCA, state.SCB, bias=bias, dtype=out_dtype)
                 output = output.to(A.dtype)
             else:  # apply bias separately
-                output = F.mm_dequant(out32, Sout32, SCA, state.SCB, bias=None)
+                output = F.mm_dequant(out32, Sout32, SCA, state.SCB, bias=None, dtype=out_dtype)
                 output = output.to(A.dtype).add_(bias)
 
         else:
-            A_wo_outliers = A.clone()
+            # only pay for the defensive copy when outlier columns have to be zeroed
             if state.idx is not None:
+                A_wo_outliers = A.clone()
                 A_wo_outliers[:, state.idx.long()] = 0
+            else:
+                A_wo_outliers = A
             output = torch.nn.functional.linear(A_wo_outliers, state.CB.to(A.dtype))
             output = output.mul_(state.SCB.unsqueeze(0).mul(1.0 / 127.0))
             if bias is not None:
@@ -418,7 +569,9 @@ class MatMul8bitLt(torch.autograd.Function):
 
         # 4. Mixed-precision decomposition matmul
         if coo_tensorA is not None and subA is not None:
-            output += torch.matmul(subA, state.subB)
+            # accumulate the outlier matmul into the output inside the GEMM
+            # epilogue instead of materializing it and adding in a second kernel
+            output.addmm_(subA, state.subB)
 
         # 5. Save state
         ctx.state = state
@@ -427,13 +580,8 @@ class MatMul8bitLt(torch.autograd.Function):
         ctx.grad_shape = input_shape
         ctx.dtype_A, ctx.dtype_B, ctx.dtype_bias = A.dtype, B.dtype, None if bias is None else bias.dtype
 
-        if any(ctx.needs_input_grad[:2]):
-            ctx.tensors = (CAt, subA, A)
-            ctx.tensor_states = (SCAt, state.idx)
-        else:
-            ctx.tensors = [None, None, A]
-            ctx.tensor_states = (None, None)
-            ctx.save_for_backward(None, None)
+        ctx.tensors = (CAt, subA, A) if req_grads else (None, None, A)
+        ctx.tensor_states = (SCAt, state.idx) if req_grads else (None, None)
 
         clone_func = torch.clone if len(output_shape) == 3 else lambda x: x
         return clone_func(output.view(output_shape))
@@ -458,7 +606,18 @@ class MatMul8bitLt(torch.autograd.Function):
         if len(grad_output.shape) == 3:
             grad_output = grad_output.reshape(-1, grad_output.shape[-1]).contiguous()
 
-        Cgrad, Cgradt, SCgrad, SCgradt, coo_tensor = F.double_quant(grad_output.to(torch.float16))
+        # the kernel writes the row- and column-quantized gradient in a single
+        # read of grad_output; the transposed half is only consumed by the
+        # weight gradient, so skip it when only grad_A is needed
+        grad_fp16 = grad_output if grad_output.dtype == torch.float16 else grad_output.to(torch.float16)
+        Cgrad, Cgradt, SCgrad, SCgradt, coo_tensor = F.double_quant(grad_fp16, compute_transpose=req_gradB)
+
+        # the transformed weight layout is shape-independent of the gradient, so it is
+        # computed once per weight update (reset_grads clears it) and reused across
+        # gradient-accumulation steps
+        if req_gradA and state.CBt is not None and state.CxBt is None:
+            state.CxBt, state.SBt = F.transform(state.CBt, to_order=formatB, transpose=True)
+
         if req_gradB:
             CxAt, SAt = F.transform(CAt, formatB, transpose=True)
             C32grad, Sgrad = F.transform(Cgradt, "col32", transpose=True)
@@ -470,13 +629,20 @@ class MatMul8bitLt(torch.autograd.Function):
         if req_gradA:
             if state.CBt is not None:
                 C32grad, Sgrad = F.transform(Cgrad, "col32")
-                if state.CxBt is None:
-                    state.CxBt, state.SBt = F.transform(state.CBt, to_order=formatB, transpose=True)
                 gradA32, SgradA32 = F.igemmlt(C32grad, state.CxBt, Sgrad, state.SBt)
-                grad_A = F.mm_dequant(gradA32, SgradA32, SCgrad, state.SCBt).view(ctx.grad_shape).to(ctx.dtype_A)
+                # emit bf16 straight from the dequant kernel so bf16 gradients
+                # skip the fp16 round-trip over grad_A
+                grad_dtype = ctx.dtype_A if ctx.dtype_A == torch.bfloat16 else torch.float16
+                grad_A = F.mm_dequant(gradA32, SgradA32, SCgrad, state.SCBt, dtype=grad_dtype).view(ctx.grad_shape).to(ctx.dtype_A)
 
             elif state.CB is not None:
-                CB = state.CB.to(ctx.dtype_A, copy=True).mul_(state.SCB.unsqueeze(1).mul(1.0 / 127.0))
+                # materializing the dequantized weight is bandwidth-heavy; for frozen
+                # weights it is the same every step, so cache it on the state
+                # (reset_grads invalidates it whenever CB is requantized)
+                CB = state._dequant_CB
+                if CB is None or CB.dtype != ctx.dtype_A:
+                    CB = state.CB.to(ctx.dtype_A, copy=True).mul_(state.SCB.unsqueeze(1).mul(1.0 / 127.0))
+                    state._dequant_CB = CB
                 grad_A = torch.matmul(grad_output, CB).view(ctx.grad_shape).to(ctx.dtype_A)
             elif state.CxB is not None:
                 CB = (
@@ -499,7 +665,7 @@ class MatMul4Bit(torch.autograd.Function):
     def forward(ctx, A, B, out=None, bias=None, quant_state: Optional[F.QuantState] = None):
         # default of pytorch behavior if inputs are empty
         ctx.is_empty = False
-        if prod(A.shape) == 0:
+        if A.numel() == 0:
             ctx.is_empty = True
             ctx.A = A
             ctx.B = B
@@ -569,7 +735,10 @@ def matmul_4bit(A: torch.Tensor, B: torch.Tensor, quant_state: F.QuantState, out
             warn(f'Some matrices hidden dimension is not a multiple of {quant_state.blocksize} and efficient inference kernels are not supported for these (slow). Matrix input size found: {A.shape}')
             return MatMul4Bit.apply(A, B, out, bias, quant_state)
         else:
-            out = F.gemv_4bit(A, B.t(), out, state=quant_state)
+            # the gemv kernel reads the packed buffer in its stored order (the
+            # shapes come from quant_state), so the caller's transpose does not
+            # need to be undone with another metadata view here
+            out = F.gemv_4bit(A, B, out, state=quant_state)
             if bias is not None:
                 out += bias
             return out
@@ -6,6 +6,7 @@ import torch
 from bitsandbytes.cuda_setup.main import CUDASetup
 
 setup = CUDASetup.get_instance()
+setup.wait_for_setup()  # joins the background setup started via BNB_ASYNC_INIT=1
 if setup.initialized != True:
     setup.run_cuda_setup()
 
@@ -103,6 +103,29 @@ class CUDASetup:
             self.lib = None
             self.initialized = False
             self.error = False
+            self.setup_thread = None
+
+    def run_cuda_setup_async(self):
+        """Run the CUDA probing and library load in a background thread.
+
+        This hides the 50-200ms of setup latency behind the remaining package
+        imports on cold start. Callers must invoke wait_for_setup() before
+        touching `lib`. Opt-in via BNB_ASYNC_INIT=1.
+        """
+        if self.initialized or self.setup_thread is not None:
+            # setup already ran (or is running); never start a second,
+            # concurrent run — it would reassign `lib` and reset the log
+            # under the feet of whoever triggered the first one
+            return
+        import threading
+        self.setup_thread = threading.Thread(target=self.run_cuda_setup, daemon=True)
+        self.setup_thread.start()
+
+    def wait_for_setup(self):
+        thread = getattr(self, 'setup_thread', None)
+        if thread is not None:
+            thread.join()
+            self.setup_thread = None
 
     def manual_override(self):
         if not torch.cuda.is_available():
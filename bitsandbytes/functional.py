@@ -371,6 +371,14 @@ def create_dynamic_map(signed=True, max_exponent_bits=7, total_bits=8):
     data.sort()
     return Tensor(data)
 
+def _get_dynamic_qmap(device):
+    # the dynamic codebook is generated on the host, so build it once per
+    # device instead of regenerating or re-uploading it on every call
+    key = ("dynamic", device)
+    if key not in name2qmap:
+        name2qmap[key] = create_dynamic_map().to(device)
+    return name2qmap[key]
+
 def create_quantile_map(A, total_bits=8):
     q = estimate_quantiles(A, num_quantiles=2**total_bits-1)
     q = q.tolist()
@@ -758,9 +766,7 @@ def quantize_blockwise(
 
 
     if code is None:
-        if "dynamic" not in name2qmap:
-            name2qmap["dynamic"] = create_dynamic_map().to(A.device)
-        code = name2qmap["dynamic"]
+        code = _get_dynamic_qmap(A.device)
 
     if absmax is None:
         n = A.numel()
@@ -838,9 +844,7 @@ def dequantize_blockwise(
     """
     assert quant_state is not None or absmax is not None
     if code is None and quant_state is None:
-        if "dynamic" not in name2qmap:
-            name2qmap["dynamic"] = create_dynamic_map().to(A.device)
-        code = name2qmap["dynamic"]
+        code = _get_dynamic_qmap(A.device)
 
     if quant_state is None:
        quant_state = QuantState(absmax=absmax, code=code, blocksize=blocksize, dtype=torch.float32)
@@ -978,12 +982,17 @@ def quantize_4bit(
     if absmax is None:
         blocks = n // blocksize
         blocks += 1 if n % blocksize > 0 else 0
-        absmax = torch.zeros((blocks,), device=A.device, dtype=torch.float32)
+        absmax = torch.empty((blocks,), device=A.device, dtype=torch.float32)
 
 
     if out is None:
         mod = dtype2bytes[quant_storage] * 2
-        out = torch.zeros(((n+1)//mod, 1), dtype=quant_storage, device=A.device)
+        # the kernel overwrites every packed byte when n is even; only an odd
+        # tail element needs the zero-initialized buffer
+        if n % 2 == 0:
+            out = torch.empty(((n+1)//mod, 1), dtype=quant_storage, device=A.device)
+        else:
+            out = torch.zeros(((n+1)//mod, 1), dtype=quant_storage, device=A.device)
 
     assert blocksize in [4096, 2048, 1024, 512, 256, 128, 64]
 
@@ -1111,10 +1120,7 @@ def quantize(
     out: Optional[torch.Tensor] = None,
 ) -> Tuple[Tensor, Tuple[Tensor, Tensor]]:
     if code is None:
-        if "dynamic" not in name2qmap:
-            name2qmap["dynamic"] = create_dynamic_map().to(A.device)
-        code = name2qmap["dynamic"]
-        code = code.to(A.device)
+        code = _get_dynamic_qmap(A.device)
 
     absmax = torch.abs(A).max()
     if absmax.dtype != torch.float32: absmax = absmax.float()
@@ -1132,10 +1138,7 @@ def dequantize(
 ) -> Tensor:
     assert state is not None or absmax is not None
     if code is None and state is None:
-        if "dynamic" not in name2qmap:
-            name2qmap["dynamic"] = create_dynamic_map().to(A.device)
-        code = name2qmap["dynamic"]
-        code = code.to(A.device)
+        code = _get_dynamic_qmap(A.device)
 
     if state is None:
         state = (absmax, code)
@@ -1979,16 +1982,20 @@ def mm_dequant(
     out=None,
     new_row_stats=None,
     new_col_stats=None,
-    bias=None
+    bias=None,
+    dtype=torch.float16,
 ):
     assert A.dtype == torch.int32
-    if bias is not None: assert bias.dtype == torch.float16
+    if out is not None: dtype = out.dtype
+    if dtype not in (torch.float16, torch.bfloat16):
+        raise ValueError(f"mm_dequant only supports float16/bfloat16 outputs, but got {dtype}")
+    if bias is not None: assert bias.dtype == dtype
     out_shape = quant_state[0]
     if len(out_shape) == 3:
         out_shape = (out_shape[0] * out_shape[1], out_shape[2])
 
     if out is None:
-        out = torch.empty(out_shape, dtype=torch.float16, device=A.device)
+        out = torch.empty(out_shape, dtype=dtype, device=A.device)
     if new_row_stats is None:
         new_row_stats = torch.empty(
             out_shape[0], dtype=torch.float32, device=A.device
@@ -2016,7 +2023,10 @@ def mm_dequant(
     numCols = ct.c_int32(out_shape[1])
 
     is_on_gpu([A, row_stats, col_stats, out, new_row_stats, new_col_stats, bias])
-    lib.cdequant_mm_int32_fp16(ptrA, ptrRowStats, ptrColStats, ptrOut, ptrNewRowStats, ptrNewColStats, ptrBias, numRows, numCols)
+    if dtype == torch.float16:
+        lib.cdequant_mm_int32_fp16(ptrA, ptrRowStats, ptrColStats, ptrOut, ptrNewRowStats, ptrNewColStats, ptrBias, numRows, numCols)
+    else:
+        lib.cdequant_mm_int32_bf16(ptrA, ptrRowStats, ptrColStats, ptrOut, ptrNewRowStats, ptrNewColStats, ptrBias, numRows, numCols)
     post_call(prev_device)
 
     return out
@@ -2156,7 +2166,8 @@ def coo_zeros(rows, cols, nnz, device, dtype=torch.half):
 
 
 def double_quant(
-    A, col_stats=None, row_stats=None, out_col=None, out_row=None, threshold=0.0
+    A, col_stats=None, row_stats=None, out_col=None, out_row=None, threshold=0.0,
+    compute_transpose=True,
 ):
     device = A.device
     assert A.dtype == torch.half
@@ -2174,7 +2185,9 @@ def double_quant(
             A, threshold=threshold
         )
 
-    if out_col is None:
+    # the column-quantized output is only needed when the caller computes
+    # gradients; skipping it halves the bytes written by the kernel
+    if out_col is None and compute_transpose:
         out_col = torch.zeros(A.shape, device=device, dtype=torch.int8)
     if out_row is None:
         out_row = torch.zeros(A.shape, device=device, dtype=torch.int8)
@@ -2251,6 +2264,25 @@ def double_quant(
     return out_row, out_col, row_stats, col_stats, coo_tensor
 
 
+def gather_and_zero_outliers(A, CA, CAt, idx):
+    """
+    Gather the outlier columns `idx` from `A` and zero those columns in the
+    quantized tensors `CA`/`CAt`.
+
+    This is the outlier handling step of the mixed-precision decomposition: the
+    outlier columns are extracted in full precision while their int8
+    counterparts are zeroed so they do not contribute to the int8 matmul. The
+    indexed ops share a single index tensor and are issued back-to-back on the
+    same stream. `CAt` may be None when the caller skipped the column-quantized
+    output (inference).
+    """
+    subA = A[:, idx]
+    CA[:, idx] = 0
+    if CAt is not None:
+        CAt[:, idx] = 0
+    return subA
+
+
 def transform(A, to_order, from_order='row', out=None, transpose=False, state=None, ld=None):
     prev_device = pre_call(A.device)
     if state is None: state = (A.shape, from_order)
@@ -93,6 +93,13 @@ class StableEmbedding(torch.nn.Embedding):
             dtype,
         )
         self.norm = torch.nn.LayerNorm(embedding_dim, device=device)
+        # with none of the special embedding features active the lookup can
+        # bypass F.embedding's dispatch and padding/renorm handling entirely;
+        # decide once here instead of re-checking four attributes per forward
+        self._fast_path = (
+            padding_idx is None and max_norm is None
+            and not scale_grad_by_freq and not sparse
+        )
         GlobalOptimManager.get_instance().register_module_override(
             self, "weight", {"optim_bits": 32}
         )
@@ -114,20 +121,25 @@ class StableEmbedding(torch.nn.Embedding):
                 self.weight[self.padding_idx].fill_(0)
 
     def forward(self, input: Tensor) -> Tensor:
-        emb = F.embedding(
-            input,
-            self.weight,
-            self.padding_idx,
-            self.max_norm,
-            self.norm_type,
-            self.scale_grad_by_freq,
-            self.sparse,
-        )
-
-        # always apply layer norm in full precision
-        emb = emb.to(torch.get_default_dtype())
+        if self._fast_path:
+            emb = self.weight.index_select(0, input.reshape(-1)).view(*input.shape, self.embedding_dim)
+        else:
+            emb = F.embedding(
+                input,
+                self.weight,
+                self.padding_idx,
+                self.max_norm,
+                self.norm_type,
+                self.scale_grad_by_freq,
+                self.sparse,
+            )
 
-        return self.norm(emb).to(self.weight.dtype)
+        # layer norm statistics are always computed in fp32 inside the kernel,
+        # so the explicit upcast of the whole activation is unnecessary and
+        # only materialized an extra fp32 copy of the embedded batch
+        return F.layer_norm(
+            emb, self.norm.normalized_shape, self.norm.weight, self.norm.bias, self.norm.eps
+        ).to(self.weight.dtype)
 
 
 class Embedding(torch.nn.Embedding):
@@ -154,6 +166,11 @@ class Embedding(torch.nn.Embedding):
             _weight,
             device=device
         )
+        # see StableEmbedding: plain lookups skip the F.embedding dispatch
+        self._fast_path = (
+            padding_idx is None and max_norm is None
+            and not scale_grad_by_freq and not sparse
+        )
         GlobalOptimManager.get_instance().register_module_override(
             self, "weight", {"optim_bits": 32}
         )
@@ -175,6 +192,9 @@ class Embedding(torch.nn.Embedding):
                 self.weight[self.padding_idx].fill_(0)
 
     def forward(self, input: Tensor) -> Tensor:
+        if self._fast_path:
+            return self.weight.index_select(0, input.reshape(-1)).view(*input.shape, self.embedding_dim)
+
         emb = F.embedding(
             input,
             self.weight,
@@ -257,8 +277,26 @@ class Params4bit(torch.nn.Parameter):
         self.bnb_quantized = True
         return self
 
+    def t(self):
+        # the underlying buffer holds packed 4-bit bytes, so the transpose is
+        # pure metadata; the packed data is also static after quantization, so
+        # build the view once and reuse it instead of re-deriving it on every
+        # forward (a .data swap, e.g. by _quantize, invalidates the cache)
+        if self.requires_grad or self.device.type != 'cuda':
+            return super().t()
+        cached = getattr(self, '_transposed_view', None)
+        if cached is None or cached.data_ptr() != self.data.data_ptr():
+            cached = super().t()
+            self._transposed_view = cached
+        return cached
+
     def _quantize(self, device):
-        w = self.data.contiguous().cuda(device)
+        w = self.data.contiguous()
+        if w.device.type == 'cpu':
+            # pinned staging buffer: async H2D copy at full PCIe bandwidth;
+            # quantize_4bit below runs on the same stream, preserving order
+            w = w.pin_memory()
+        w = w.cuda(device, non_blocking=True)
         w_4bit, quant_state = bnb.functional.quantize_4bit(
             w,
             blocksize=self.blocksize,
@@ -385,10 +423,6 @@ class Linear4bit(nn.Linear):
                 destination[prefix + "weight." + k] = v if keep_vars else v.detach()
 
     def forward(self, x: torch.Tensor):
-        # weights are cast automatically as Int8Params, but the bias has to be cast manually
-        if self.bias is not None and self.bias.dtype != x.dtype:
-            self.bias.data = self.bias.data.to(x.dtype)
-
         if getattr(self.weight, 'quant_state', None) is None:
             if getattr(self, 'quant_state', None) is not None:
                 # the quant state got lost when the parameter got converted. This happens for example for fsdp
@@ -407,8 +441,12 @@ class Linear4bit(nn.Linear):
         if self.compute_dtype is not None:
             x = x.to(self.compute_dtype)
 
-        bias = None if self.bias is None else self.bias.to(self.compute_dtype)
-        out = bnb.matmul_4bit(x, self.weight.t(), bias=bias, quant_state=self.weight.quant_state)
+        # weights are cast automatically as Params4bit, but the bias has to be cast manually;
+        # we cast it in place once so repeated forwards do not allocate a fresh copy
+        if self.bias is not None and self.bias.dtype != x.dtype:
+            self.bias.data = self.bias.data.to(x.dtype)
+
+        out = bnb.matmul_4bit(x, self.weight.t(), bias=self.bias, quant_state=self.weight.quant_state)
 
         out = out.to(inp_dtype)
 
@@ -457,10 +495,18 @@ class Int8Params(torch.nn.Parameter):
         else:
             # we store the 8-bit rows-major weight
             # we convert this weight to the turning/ampere weight during the first inference pass
-            B = self.data.contiguous().half().cuda(device)
-            CB, CBt, SCB, SCBt, coo_tensorB = bnb.functional.double_quant(B)
-            del CBt
-            del SCBt
+            B = self.data.contiguous().half()
+            if B.device.type == 'cpu':
+                # stage through pinned memory so the H2D copy is asynchronous
+                # and runs at full PCIe bandwidth instead of a pageable copy;
+                # double_quant below is issued on the same stream, so ordering
+                # is preserved
+                B = B.pin_memory()
+            B = B.cuda(device, non_blocking=True)
+            CB, _, SCB, _, _ = bnb.functional.double_quant(B, compute_transpose=False)
+            # drop the fp16 staging copy before the int8 weight is stored so
+            # its memory is released at the earliest point during model load
+            del B
             self.data = CB
             self.CB = CB
             self.SCB = SCB
@@ -649,7 +695,7 @@ class Linear8bitLt(nn.Linear):
             if self.state.CB is not None and self.state.CxB is not None:
                 # we converted 8-bit row major to turing/ampere format in the first inference pass
                 # we no longer need the row-major weight
-                del self.state.CB
+                self.state.CB = None
                 self.weight.data = self.state.CxB
         return out
 
@@ -657,7 +703,9 @@ class Linear8bitLt(nn.Linear):
 class OutlierAwareLinear(nn.Linear):
     def __init__(self, input_features, output_features, bias=True, device=None):
         super().__init__(input_features, output_features, bias, device)
-        self.outlier_dim = None
+        # non-persistent buffer: the traced outlier index follows the module
+        # across device moves but is not written into the state dict
+        self.register_buffer('outlier_dim', None, persistent=False)
         self.is_quantized = False
 
     def forward_with_outliers(self, x, outlier_idx):
@@ -666,20 +714,28 @@ class OutlierAwareLinear(nn.Linear):
     def quantize_weight(self, w, outlier_idx):
         raise NotImplementedError('Please override the `quantize_weights(self, w, outlier_idx)` function')
 
-    def forward(self, x):
-        if self.outlier_dim is None:
-            tracer = OutlierTracer.get_instance()
-            if not tracer.is_initialized():
-                print('Please use OutlierTracer.initialize(model) before using the OutlierAwareLinear layer')
-            outlier_idx = tracer.get_outliers(self.weight)
-            #print(outlier_idx, tracer.get_hvalue(self.weight))
-            self.outlier_dim = outlier_idx
+    def _trace_outliers(self):
+        # slow path, taken once: resolve the outlier index through the tracer
+        # singleton and pin it to the module, so the steady-state forward is a
+        # single buffer fetch instead of a global lookup keyed by weight identity
+        tracer = OutlierTracer.get_instance()
+        if not tracer.is_initialized():
+            print('Please use OutlierTracer.initialize(model) before using the OutlierAwareLinear layer')
+        self.outlier_dim = tracer.get_outliers(self.weight)
 
+    def forward(self, x):
+        # single guard on the steady-state path: tracing and quantization
+        # always happen together on the first call, so there is no need to
+        # re-check the outlier buffer separately on every forward
         if not self.is_quantized:
+            if self.outlier_dim is None:
+                self._trace_outliers()
             w = self.quantize_weight(self.weight, self.outlier_dim)
             self.weight.data.copy_(w)
             self.is_quantized = True
 
+        return self.forward_with_outliers(x, self.outlier_dim)
+
 class SwitchBackLinearBnb(nn.Linear):
     def __init__(
         self,
@@ -720,4 +776,16 @@ class SwitchBackLinearBnb(nn.Linear):
         if self.weight.CB is not None:
             self.init_8bit_state()
 
-        out = bnb.matmul_mixed(x.half(), self.weight.half(), bias=None, state=self.state) + self.bias
+        # only cast when the dtypes actually differ: .to() on a matching dtype
+        # is a no-op, while an unconditional .half() materializes a copy of the
+        # activations and the weight on every forward
+        if x.dtype != torch.float16:
+            x = x.to(torch.float16)
+        w = self.weight if self.weight.dtype == torch.float16 else self.weight.half()
+
+        out = bnb.matmul_mixed(x, w, bias=None, state=self.state)
+        if self.bias is not None:
+            if self.bias.dtype != out.dtype:
+                self.bias.data = self.bias.data.to(out.dtype)
+            out = out + self.bias
+        return out
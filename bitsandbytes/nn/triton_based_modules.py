@@ -4,6 +4,9 @@ import torch
 import torch.nn as nn
 
 from bitsandbytes.triton.dequantize_rowwise import dequantize_rowwise
+from bitsandbytes.triton.int8_matmul_fused_quantize import (
+    int8_matmul_fused_quantize,
+)
 from bitsandbytes.triton.int8_matmul_mixed_dequantize import (
     int8_matmul_mixed_dequantize,
 )
@@ -215,17 +218,14 @@ class SwitchBackLinear(nn.Linear):
                 return self._fn.apply(x, self.weight, self.bias)
 
             # Otherwise, use pre-computed weights.
+            # The per-token quantization is fused into the matmul, so the
+            # activations are quantized in registers instead of taking an
+            # int8 round-trip through global memory via quantize_rowwise.
             X = x.view(-1, x.size(-1))
-            X_int8, state_X = quantize_rowwise(X)
-
-            if self.vector_wise_quantization:
-                return int8_matmul_rowwise_dequantize(
-                    X_int8, self.W_int8.t(), state_X, self.state_W, self.bias
-                ).view(*x.size()[:-1], -1)
-            else:
-                return int8_matmul_mixed_dequantize(
-                    X_int8, self.W_int8.t(), state_X, self.state_W, self.bias
-                ).view(*x.size()[:-1], -1)
+            return int8_matmul_fused_quantize(
+                X, self.W_int8.t(), self.state_W, self.bias,
+                w_global=not self.vector_wise_quantization,
+            ).view(*x.size()[:-1], -1)
 
 SwitchBackLinearGlobal = partial(SwitchBackLinear, vector_wise_quantization=False)
 SwitchBackLinearGlobalMemEfficient = partial(SwitchBackLinear, vector_wise_quantization=False, mem_efficient=True)
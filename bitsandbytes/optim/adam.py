@@ -91,6 +91,24 @@ class AnalysisAdam(torch.optim.Optimizer):
         super().__init__(params, defaults)
         self.analysis = bnb_analysis
         self.savedir = savedir
+        self.name2qmap = {}
+
+    def get_qmap(self, name, device):
+        # the codebooks are generated on the host, so build each one once per
+        # device instead of regenerating and re-uploading it for every
+        # parameter on every step
+        key = (name, device)
+        if key not in self.name2qmap:
+            if name == "dynamic":
+                code = F.create_dynamic_map(signed=True)
+            elif name == "udynamic":
+                code = F.create_dynamic_map(signed=False)
+            elif name == "linear":
+                code = F.create_linear_map(signed=True)
+            else:
+                code = F.create_linear_map(signed=False)
+            self.name2qmap[key] = code.to(device)
+        return self.name2qmap[key]
 
     @property
     def supports_memory_efficient_fp16(self):
@@ -193,22 +211,22 @@ class AnalysisAdam(torch.optim.Optimizer):
                     p_data_fp32 += -step_size * update_fp32
                 else:
                     if self.analysis == "dynamic-blockwise":
-                        code1 = F.create_dynamic_map(signed=True).to(p.device)
-                        code2 = F.create_dynamic_map(signed=False).to(p.device)
+                        code1 = self.get_qmap("dynamic", p.device)
+                        code2 = self.get_qmap("udynamic", p.device)
                         C1, S1 = F.quantize_blockwise(exp_avg, code=code1)
                         state1 = F.dequantize_blockwise(C1, S1)
                         C2, S2 = F.quantize_blockwise(exp_avg_sq, code=code2)
                         state2 = F.dequantize_blockwise(C2, S2)
                     elif self.analysis == "dynamic":
-                        code1 = F.create_dynamic_map(signed=True).to(p.device)
-                        code2 = F.create_dynamic_map(signed=False).to(p.device)
+                        code1 = self.get_qmap("dynamic", p.device)
+                        code2 = self.get_qmap("udynamic", p.device)
                         C1, S1 = F.quantize(exp_avg, code=code1)
                         state1 = F.dequantize(C1, S1)
                         C2, S2 = F.quantize(exp_avg_sq, code=code2)
                         state2 = F.dequantize(C2, S2)
                     elif self.analysis == "linear":
-                        code1 = F.create_linear_map(signed=True).to(p.device)
-                        code2 = F.create_linear_map(signed=False).to(p.device)
+                        code1 = self.get_qmap("linear", p.device)
+                        code2 = self.get_qmap("ulinear", p.device)
                         C1, S1 = F.quantize(exp_avg, code=code1)
                         state1 = F.dequantize(C1, S1)
                         C2, S2 = F.quantize(exp_avg_sq, code=code2)
@@ -7,12 +7,28 @@ import bitsandbytes as bnb
 
 T = TypeVar("T", bound="torch.nn.Module")
 
+# one fp8 codebook pair per device, shared by every layer instance; without
+# this each of the (often dozens of) linears builds and uploads its own copy
+# of the same two 256-entry maps on first forward
+_fp8_code_cache = {}
+
+
+def _get_fp8_codes(device):
+    codes = _fp8_code_cache.get(device)
+    if codes is None:
+        fw_code = bnb.functional.create_fp8_map(True, 4, 3, 8).to(device)
+        bw_code = bnb.functional.create_fp8_map(True, 5, 2, 8).to(device)
+        codes = _fp8_code_cache[device] = (fw_code, bw_code)
+    return codes
+
 
 class LinearFP8Mixed(nn.Linear):
     def __init__(self, input_features, output_features, bias=True):
         super().__init__(input_features, output_features, bias)
         self.bw_code = None
         self.fw_code = None
+        self._weight_t = None
+        self._weight_t_src = None
         array = [4096, 2048, 1024, 512, 256, 128, 64, 0]
         for i, k in enumerate(array):
             if input_features > array[i + 1]:
@@ -23,12 +39,34 @@ class LinearFP8Mixed(nn.Linear):
                 self.bsz2 = k
                 break
 
+    def _get_weight_t(self):
+        # frozen weights get a one-time contiguous pre-transposed copy, so the
+        # blockwise quantization inside matmul_fp8 reads coalesced memory each
+        # forward; trainable weights keep the plain view to pick up updates
+        if self.weight.requires_grad or not self.weight.is_cuda:
+            return self.weight.t()
+        # _version increments on every in-place mutation, catching
+        # weight.data.copy_()/mul_() which leave the pointer untouched, and
+        # disambiguating a weight.data swap that reuses the old address
+        src = (self.weight.data_ptr(), self.weight._version)
+        cached = self._weight_t
+        if (cached is None or self._weight_t_src != src
+                or cached.dtype != self.weight.dtype or cached.device != self.weight.device):
+            cached = self.weight.t().contiguous()
+            self._weight_t = cached
+            self._weight_t_src = src
+        return cached
+
+    def _load_from_state_dict(self, *args, **kwargs):
+        # loading copies into the parameter in place; drop the stale copy
+        self._weight_t = None
+        super()._load_from_state_dict(*args, **kwargs)
+
     def forward(self, x: torch.Tensor):
         if self.fw_code is None:
-            self.bw_code = bnb.functional.create_fp8_map(True, 5, 2, 8).to(x.device)
-            self.fw_code = bnb.functional.create_fp8_map(True, 4, 3, 8).to(x.device)
+            self.fw_code, self.bw_code = _get_fp8_codes(x.device)
 
-        out = bnb.research.matmul_fp8_mixed(x, self.weight.t(), fw_code=self.fw_code, bw_code=self.bw_code, bsz=self.bsz, bsz2=self.bsz2)
+        out = bnb.research.matmul_fp8_mixed(x, self._get_weight_t(), fw_code=self.fw_code, bw_code=self.bw_code, bsz=self.bsz, bsz2=self.bsz2)
         if self.bias is not None:
             out += self.bias
 
@@ -39,6 +77,8 @@ class LinearFP8Global(nn.Linear):
         super().__init__(input_features, output_features, bias)
         self.bw_code = None
         self.fw_code = None
+        self._weight_t = None
+        self._weight_t_src = None
         array = [4096, 2048, 1024, 512, 256, 128, 64, 0]
         for i, k in enumerate(array):
             if input_features > array[i + 1]:
@@ -49,12 +89,34 @@ class LinearFP8Global(nn.Linear):
                 self.bsz2 = k
                 break
 
+    def _get_weight_t(self):
+        # frozen weights get a one-time contiguous pre-transposed copy, so the
+        # blockwise quantization inside matmul_fp8 reads coalesced memory each
+        # forward; trainable weights keep the plain view to pick up updates
+        if self.weight.requires_grad or not self.weight.is_cuda:
+            return self.weight.t()
+        # _version increments on every in-place mutation, catching
+        # weight.data.copy_()/mul_() which leave the pointer untouched, and
+        # disambiguating a weight.data swap that reuses the old address
+        src = (self.weight.data_ptr(), self.weight._version)
+        cached = self._weight_t
+        if (cached is None or self._weight_t_src != src
+                or cached.dtype != self.weight.dtype or cached.device != self.weight.device):
+            cached = self.weight.t().contiguous()
+            self._weight_t = cached
+            self._weight_t_src = src
+        return cached
+
+    def _load_from_state_dict(self, *args, **kwargs):
+        # loading copies into the parameter in place; drop the stale copy
+        self._weight_t = None
+        super()._load_from_state_dict(*args, **kwargs)
+
     def forward(self, x: torch.Tensor):
         if self.fw_code is None:
-            self.bw_code = bnb.functional.create_fp8_map(True, 5, 2, 8).to(x.device)
-            self.fw_code = bnb.functional.create_fp8_map(True, 4, 3, 8).to(x.device)
+            self.fw_code, self.bw_code = _get_fp8_codes(x.device)
 
-        out = bnb.matmul_fp8_global(x, self.weight.t(), fw_code=self.fw_code, bw_code=self.bw_code, bsz=self.bsz, bsz2=self.bsz2)
+        out = bnb.matmul_fp8_global(x, self._get_weight_t(), fw_code=self.fw_code, bw_code=self.bw_code, bsz=self.bsz, bsz2=self.bsz2)
         if self.bias is not None:
             out += self.bias
 
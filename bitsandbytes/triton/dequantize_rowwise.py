@@ -1,5 +1,3 @@
-import math
-
 import torch
 
 from bitsandbytes.triton.triton_utils import is_triton_available
@@ -55,7 +53,8 @@ else:
     def dequantize_rowwise(x: torch.Tensor, state_x: torch.Tensor):
         output = torch.empty(*x.shape, device=x.device, dtype=torch.float16)
 
-        P2 = int(2 ** (math.ceil(math.log2(x.shape[1]))))
+        # next power of two in integer arithmetic, no float log/pow round-trip
+        P2 = 1 << (x.shape[1] - 1).bit_length()
 
         assert x.is_cuda and output.is_cuda
         n_elements = output.numel()
@@ -1,5 +1,3 @@
-import math
-
 import torch
 
 from bitsandbytes.triton.triton_utils import is_triton_available
@@ -64,7 +62,8 @@ else:
         output = torch.empty(N, M, device=x.device, dtype=torch.int8)
         output_maxs = torch.empty(x.shape[1], device=x.device, dtype=torch.float16)
 
-        P2 = int(2 ** (math.ceil(math.log2(M))))
+        # next power of two in integer arithmetic, no float log/pow round-trip
+        P2 = 1 << (M - 1).bit_length()
 
         assert x.is_cuda and output.is_cuda
         n_elements = output.numel()
@@ -1,5 +1,3 @@
-import math
-
 import torch
 
 from bitsandbytes.triton.triton_utils import is_triton_available
@@ -13,24 +11,6 @@ else:
 
     # rowwise quantize
 
-    # TODO: autotune this better.
-    @triton.autotune(
-            configs=[
-                triton.Config({}, num_stages=1, num_warps=8),
-                triton.Config({}, num_stages=2, num_warps=8),
-                triton.Config({}, num_stages=4, num_warps=8),
-                triton.Config({}, num_stages=8, num_warps=8),
-                triton.Config({}, num_stages=1),
-                triton.Config({}, num_stages=2),
-                triton.Config({}, num_stages=4),
-                triton.Config({}, num_stages=8),
-                triton.Config({}, num_warps=1),
-                triton.Config({}, num_warps=2),
-                triton.Config({}, num_warps=4),
-                triton.Config({}, num_warps=8),
-            ],
-            key=['n_elements']
-    )
     @triton.jit
     def _quantize_rowwise(
         x_ptr,
@@ -38,29 +18,51 @@ else:
         output_maxs,
         n_elements,
         BLOCK_SIZE: tl.constexpr,
-        P2: tl.constexpr,
+        BLOCK_COL: tl.constexpr,
     ):
         pid = tl.program_id(axis=0)
         block_start = pid * BLOCK_SIZE
-        arange = tl.arange(0, P2)
-        offsets = block_start + arange
-        row_mask = arange < BLOCK_SIZE
-        x = tl.load(x_ptr + offsets, mask=row_mask)
+        arange = tl.arange(0, BLOCK_COL)
+
+        # pass 1: tiled absmax reduction over the row. Looping in BLOCK_COL
+        # tiles avoids padding the row to the next power of two, which wasted
+        # up to half the lanes on non-power-of-two widths
+        max_val = 0.0
+        for off in range(0, BLOCK_SIZE, BLOCK_COL):
+            mask = off + arange < BLOCK_SIZE
+            x = tl.load(x_ptr + block_start + off + arange, mask=mask, other=0.0)
+            max_val = tl.maximum(max_val, tl.max(tl.abs(x), axis=0))
+
+        # pass 2: re-load (tiles are L2-resident by now) and store the scaled row.
+        # one reciprocal broadcast instead of a per-lane divide, and a single-
+        # precision rint instead of the double-precision llrint whose int64
+        # result inflated register pressure; the product is already integral
+        # and within [-127, 127], so the int8 cast is exact
+        scale = 127. / max_val
+        for off in range(0, BLOCK_SIZE, BLOCK_COL):
+            mask = off + arange < BLOCK_SIZE
+            x = tl.load(x_ptr + block_start + off + arange, mask=mask)
+            output = tl.libdevice.rint(x * scale).to(tl.int8)
+            tl.store(output_ptr + block_start + off + arange, output, mask=mask)
 
-        abs_x = tl.abs(x)
-        max_val = tl.max(tl.where(row_mask, abs_x, 0), axis=0)
-        output = tl.libdevice.llrint(127. * (x / max_val))
-        tl.store(output_ptr + offsets, output, mask=row_mask)
         tl.store(output_maxs + pid, max_val)
 
     def quantize_rowwise(x: torch.Tensor):
-        output = torch.empty(*x.shape, device=x.device, dtype=torch.int8)
-        output_maxs = torch.empty(x.shape[0], device=x.device, dtype=torch.float16)
-
-        P2 = int(2 ** (math.ceil(math.log2(x.shape[1]))))
+        # carve the int8 output and the fp16 row maxima out of one slab: a
+        # single allocator round-trip per call instead of two, which adds up
+        # when this fires per token during decoding
+        n = x.shape[0] * x.shape[1]
+        maxs_offset = n + (n % 2)  # keep the fp16 view 2-byte aligned
+        buf = torch.empty(maxs_offset + 2 * x.shape[0], device=x.device, dtype=torch.uint8)
+        output = buf[:n].view(torch.int8).view(x.shape)
+        output_maxs = buf[maxs_offset:].view(torch.float16)
 
         assert x.is_cuda and output.is_cuda
         n_elements = output.numel()
+
+        # the tile width is fixed, so the launch shape no longer depends on the
+        # padded row width; the kernel is memory-bound and 4 warps cover the
+        # 128 lanes of a tile
         grid = lambda meta: (x.shape[0],)
-        _quantize_rowwise[grid](x, output, output_maxs, n_elements, BLOCK_SIZE=x.shape[1], P2=P2)
+        _quantize_rowwise[grid](x, output, output_maxs, n_elements, BLOCK_SIZE=x.shape[1], BLOCK_COL=128, num_warps=4, num_stages=2)
         return output, output_maxs
@@ -487,7 +487,7 @@ int fill_up_to_nearest_multiple(int value, int multiple)
   return value + (value % multiple == 0 ? 0 : (multiple - (value % multiple)));
 }
 
-void dequant_mm_int32_fp16(int *A, float *rowStats, float *colStats, half *out, float* newRowStats, float* newcolStats, half *bias, int numRows, int numCols)
+template <typename T> void dequant_mm_int32_fp16(int *A, float *rowStats, float *colStats, T *out, float* newRowStats, float* newcolStats, T *bias, int numRows, int numCols)
 {
   int threads = 512;
   int tileCols = fill_up_to_nearest_multiple(numCols, 32);
@@ -499,10 +499,13 @@ void dequant_mm_int32_fp16(int *A, float *rowStats, float *colStats, half *out,
   num_blocks = num_blocks*(tileCols/32);
   assert(threads <= tilesize);
 
-  kdequant_mm_int32_fp16<4, 128, 512><<<num_blocks, threads>>>(A, rowStats, colStats, out, newRowStats, newcolStats, bias, numRows, numCols, tileCols, n);
+  kdequant_mm_int32_fp16<T, 4, 128, 512><<<num_blocks, threads>>>(A, rowStats, colStats, out, newRowStats, newcolStats, bias, numRows, numCols, tileCols, n);
   CUDA_CHECK_RETURN(cudaPeekAtLastError());
 }
 
+template void dequant_mm_int32_fp16<half>(int *A, float *rowStats, float *colStats, half *out, float* newRowStats, float* newcolStats, half *bias, int numRows, int numCols);
+template void dequant_mm_int32_fp16<__nv_bfloat16>(int *A, float *rowStats, float *colStats, __nv_bfloat16 *out, float* newRowStats, float* newcolStats, __nv_bfloat16 *bias, int numRows, int numCols);
+
 #define STATS_THREADS 64
 #define STATS_ITEMS 4
 #define STATS_ROWS 16
@@ -331,7 +331,9 @@ extern "C"
 	MAKE_FUNC_CTRANSFORM(32, col32, row, n, int32_t, COL32, ROW, false, 32)
 
 	void cdequant_mm_int32_fp16(int *A, float *rowStats, float *colStats, half *out, float* newRowStats, float* newcolStats, half* bias, int numRows, int numCols)
-	{ dequant_mm_int32_fp16(A, rowStats, colStats, out, newRowStats, newcolStats, bias, numRows, numCols); }
+	{ dequant_mm_int32_fp16<half>(A, rowStats, colStats, out, newRowStats, newcolStats, bias, numRows, numCols); }
+	void cdequant_mm_int32_bf16(int *A, float *rowStats, float *colStats, __nv_bfloat16 *out, float* newRowStats, float* newcolStats, __nv_bfloat16* bias, int numRows, int numCols)
+	{ dequant_mm_int32_fp16<__nv_bfloat16>(A, rowStats, colStats, out, newRowStats, newcolStats, bias, numRows, numCols); }
 	void cget_col_row_stats(half * A, float *rowStats, float *colStats, int *nnz_count_row, float nnz_threshold, int rows, int cols)
 	{ getColRowStats(A, rowStats, colStats, nnz_count_row, nnz_threshold, rows, cols); }
 
@@ -3,6 +3,13 @@ import torch
 
 from bitsandbytes.nn import Linear8bitLt
 from bitsandbytes.nn.triton_based_modules import SwitchBackLinear
+from bitsandbytes.triton.int8_matmul_mixed_dequantize import (
+    int8_matmul_mixed_dequantize,
+)
+from bitsandbytes.triton.int8_matmul_rowwise_dequantize import (
+    int8_matmul_rowwise_dequantize,
+)
+from bitsandbytes.triton.quantize_rowwise import quantize_rowwise
 from bitsandbytes.triton.triton_utils import is_triton_available
 from tests.helpers import TRUE_FALSE
 
@@ -58,3 +65,35 @@ def test_switchback(vector_wise_quantization):
 
             print('GX1', err_sb, err_baseline)
             assert err_sb < 2 * err_baseline
+
+
+@pytest.mark.skipif(not is_triton_available() or not torch.cuda.is_available() or not torch.cuda.get_device_capability()[0] >= 8,
+                    reason="This test requires triton and a GPU with compute capability 8.0 or higher.")
+@pytest.mark.parametrize("vector_wise_quantization", TRUE_FALSE)
+def test_switchback_eval_fused(vector_wise_quantization):
+    # the post-prepare_for_eval forward quantizes the activations inside the
+    # matmul; it must match the unfused quantize_rowwise + matmul pipeline
+    for dim in [83, 128]:
+        for batch in [13, 64]:
+            switchback = SwitchBackLinear(dim, 4 * dim, vector_wise_quantization=vector_wise_quantization).cuda().half()
+            switchback.prepare_for_eval()
+            switchback.eval()
+
+            x = torch.randn(batch, dim).cuda().half()
+            with torch.no_grad():
+                out_fused = switchback(x)
+
+                X_int8, state_X = quantize_rowwise(x)
+                if vector_wise_quantization:
+                    out_unfused = int8_matmul_rowwise_dequantize(
+                        X_int8, switchback.W_int8.t(), state_X, switchback.state_W, switchback.bias
+                    )
+                else:
+                    out_unfused = int8_matmul_mixed_dequantize(
+                        X_int8, switchback.W_int8.t(), state_X, switchback.state_W, switchback.bias
+                    )
+
+            err = (out_fused - out_unfused).abs().mean()
+            scale = out_unfused.abs().mean()
+            print('EVAL', err, scale)
+            assert err < 1e-2 * scale